@@ -1,14 +1,35 @@
 from fastmcp import FastMCP
 import os
-import sqlite3
+import threading
+import functools
+from itertools import repeat
+# pysqlite3 (pip install pysqlite3-binary) bundles a newer SQLite than many
+# distro Pythons ship; it is a drop-in replacement for the stdlib module
+try:
+    import pysqlite3 as sqlite3
+except ImportError:
+    import sqlite3
+from contextlib import contextmanager
+from pydantic import BaseModel
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "expenses.db")
 CATEGORIES_PATH = os.path.join(os.path.dirname(__file__), "categories.json")
 
 mcp = FastMCP("ExpenseTracker")
 
+def _configure(conn):
+    """Apply the per-connection PRAGMAs and return the connection."""
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
 def init_db():
-    with sqlite3.connect(DB_PATH) as c:
+    with _configure(sqlite3.connect(DB_PATH)) as c:
+        # WAL persists in the database file, so this only needs to run once
+        c.execute("PRAGMA journal_mode=WAL")
         c.execute("""
             CREATE TABLE IF NOT EXISTS expenses(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -29,115 +50,233 @@ def init_db():
                 note TEXT DEFAULT ''
             )
         """)
+        # Covering indexes for the date-range list/summarize/cashflow queries
+        c.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date_cat ON expenses(date, category, amount)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_income_date_src ON income(date, source, amount)")
+        # Gather planner statistics once so the new indexes get picked up
+        if not c.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            c.execute("ANALYZE")
 
 init_db()
 
+# One long-lived connection shared by every tool. It runs in autocommit mode,
+# so multi-statement paths open their own transaction via _txn().
+_CONN = _configure(sqlite3.connect(
+    DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256
+))
+_LOCK = threading.Lock()
+# Bumped by every write tool; together with PRAGMA data_version it keys the
+# summary caches (see _generation())
+_WRITE_GEN = [0]
+
+@contextmanager
+def _txn():
+    """Hold the connection lock for one write transaction.
+
+    BEGIN IMMEDIATE takes the write lock up front, so the transaction never has
+    to upgrade from a read lock and busy_timeout applies from the start.
+    Single-statement writes skip this; autocommit already gives them one
+    implicit transaction each.
+    """
+    with _LOCK:
+        _CONN.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            _CONN.execute("ROLLBACK")
+            raise
+        _CONN.execute("COMMIT")
+        _WRITE_GEN[0] += 1
+
+def _generation():
+    """Cache generation for the summary caches.
+
+    _WRITE_GEN counts this process's writes; PRAGMA data_version changes when
+    any other connection (another server instance, the sqlite3 CLI) commits.
+    """
+    with _LOCK:
+        return _WRITE_GEN[0], _CONN.execute("PRAGMA data_version").fetchone()[0]
+
+# ==================== SQL ====================
+# Constant statement text so sqlite3's statement cache gets a hit on every call
+# instead of re-preparing the same query.
+
+def _update_statements(table, fields):
+    """UPDATE ... RETURNING id for every non-empty subset of fields, keyed by bitmask (bit i = fields[i])."""
+    return {
+        mask: f"UPDATE {table} SET {', '.join(f'{f} = ?' for i, f in enumerate(fields) if mask >> i & 1)} WHERE id = ? RETURNING id"
+        for mask in range(1, 1 << len(fields))
+    }
+
+SQL_INSERT_EXPENSE = "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)"
+SQL_LIST_EXPENSES = """
+    SELECT id, date, amount, category, subcategory, note
+    FROM expenses
+    WHERE date BETWEEN ? AND ?
+    ORDER BY id ASC
+"""
+SQL_SUM_BY_CAT = """
+    SELECT category, SUM(amount) AS total_amount
+    FROM expenses
+    WHERE date BETWEEN ? AND ?
+    GROUP BY category ORDER BY category ASC
+"""
+SQL_SUM_ONE_CAT = """
+    SELECT category, SUM(amount) AS total_amount
+    FROM expenses
+    WHERE date BETWEEN ? AND ? AND category = ?
+    GROUP BY category ORDER BY category ASC
+"""
+SQL_GET_EXPENSE = "SELECT id, date, amount, category, subcategory, note FROM expenses WHERE id = ?"
+SQL_DELETE_EXPENSE = "DELETE FROM expenses WHERE id = ?"
+# bulk_delete_expenses reuses SQL_DELETE_EXPENSE through executemany, so one
+# prepared statement covers any number of ids
+SQL_UPDATE_EXPENSE = _update_statements("expenses", ("date", "amount", "category", "subcategory", "note"))
+
+SQL_INSERT_INCOME = "INSERT INTO income(date, amount, source, note) VALUES (?,?,?,?)"
+SQL_LIST_INCOME = """
+    SELECT id, date, amount, source, note
+    FROM income
+    WHERE date BETWEEN ? AND ?
+    ORDER BY id ASC
+"""
+SQL_SUM_BY_SRC = """
+    SELECT source, SUM(amount) AS total_amount
+    FROM income
+    WHERE date BETWEEN ? AND ?
+    GROUP BY source ORDER BY source ASC
+"""
+SQL_SUM_ONE_SRC = """
+    SELECT source, SUM(amount) AS total_amount
+    FROM income
+    WHERE date BETWEEN ? AND ? AND source = ?
+    GROUP BY source ORDER BY source ASC
+"""
+SQL_GET_INCOME = "SELECT id, date, amount, source, note FROM income WHERE id = ?"
+SQL_DELETE_INCOME = "DELETE FROM income WHERE id = ?"
+SQL_UPDATE_INCOME = _update_statements("income", ("date", "amount", "source", "note"))
+
+# Result column names, fixed by the SELECT lists above
+_EXPENSE_COLS = ("id", "date", "amount", "category", "subcategory", "note")
+_INCOME_COLS = ("id", "date", "amount", "source", "note")
+_CAT_SUM_COLS = ("category", "total_amount")
+_SRC_SUM_COLS = ("source", "total_amount")
+
+# Rounding and the sign test run in SQL on the unrounded totals; ?1/?2 are
+# the start and end dates
+SQL_NET_CASHFLOW = """
+    SELECT ROUND(inc, 2), ROUND(exp, 2), ROUND(inc - exp, 2), inc >= exp
+    FROM (SELECT
+        (SELECT COALESCE(SUM(amount), 0) FROM income WHERE date BETWEEN ?1 AND ?2) AS inc,
+        (SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date BETWEEN ?1 AND ?2) AS exp
+    )
+"""
+# Indexed by the inc >= exp flag returned above
+_CASHFLOW_STATUS = ("negative", "positive")
+
+_FETCH_CHUNK = 512
+
+def _rows_to_dicts(cols, rows):
+    """Zip each row tuple with cols into a dict; map() keeps the per-row loop in C."""
+    return map(dict, map(zip, repeat(cols), rows))
+
+def _fetch_dicts(cols, sql, params):
+    """Run a query and build row dicts chunk by chunk so only one chunk of raw tuples is alive at a time."""
+    cur = _CONN.execute(sql, params)
+    out = []
+    while chunk := cur.fetchmany(_FETCH_CHUNK):
+        out.extend(_rows_to_dicts(cols, chunk))
+    return out
+
+# Fixed error responses, built once and shared by every call that returns them
+_ERR_NO_FIELDS = {"status": "error", "message": "No fields to update"}
+_ERR_NO_EXPENSE_IDS = {"status": "error", "message": "No expense IDs provided"}
+_ERR_NO_EXPENSES = {"status": "error", "message": "No expenses provided"}
+
+# ==================== BULK ITEM MODELS ====================
+# Typed like add_expense's arguments, so FastMCP validates every item
+
+class ExpenseItem(BaseModel):
+    date: str
+    amount: float
+    category: str
+    subcategory: str = ""
+    note: str = ""
+
 # ==================== ORIGINAL FUNCTIONS ====================
 
 @mcp.tool()
 def add_expense(date, amount, category, subcategory="", note=""):
     '''Add a new expense entry to the database.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)",
-            (date, amount, category, subcategory, note)
-        )
+    with _LOCK:
+        cur = _CONN.execute(SQL_INSERT_EXPENSE, (date, amount, category, subcategory, note))
+        _WRITE_GEN[0] += 1
         return {"status": "ok", "id": cur.lastrowid}
     
 @mcp.tool()
 def list_expenses(start_date, end_date):
     '''List expense entries within an inclusive date range.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            """
-            SELECT id, date, amount, category, subcategory, note
-            FROM expenses
-            WHERE date BETWEEN ? AND ?
-            ORDER BY id ASC
-            """,
-            (start_date, end_date)
-        )
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, r)) for r in cur.fetchall()]
+    with _LOCK:
+        return _fetch_dicts(_EXPENSE_COLS, SQL_LIST_EXPENSES, (start_date, end_date))
+
+@functools.lru_cache(maxsize=256)
+def _summarize_cached(gen, start_date, end_date, category):
+    """Summary rows as of generation gen, which is only part of the cache key."""
+    with _LOCK:
+        if category:
+            cur = _CONN.execute(SQL_SUM_ONE_CAT, (start_date, end_date, category))
+        else:
+            cur = _CONN.execute(SQL_SUM_BY_CAT, (start_date, end_date))
+        return list(_rows_to_dicts(_CAT_SUM_COLS, cur.fetchall()))
 
 @mcp.tool()
 def summarize(start_date, end_date, category=None):
     '''Summarize expenses by category within an inclusive date range.'''
-    with sqlite3.connect(DB_PATH) as c:
-        query = (
-            """
-            SELECT category, SUM(amount) AS total_amount
-            FROM expenses
-            WHERE date BETWEEN ? AND ?
-            """
-        )
-        params = [start_date, end_date]
-        if category:
-            query += " AND category = ?"
-            params.append(category)
-        query += " GROUP BY category ORDER BY category ASC"
-        cur = c.execute(query, params)
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, r)) for r in cur.fetchall()]
+    return _summarize_cached(_generation(), start_date, end_date, category)
 
 # ==================== PHASE 1: CRUD OPERATIONS ====================
 
 @mcp.tool()
 def get_expense(expense_id: int):
     '''Retrieve a single expense by its ID.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            "SELECT id, date, amount, category, subcategory, note FROM expenses WHERE id = ?",
-            (expense_id,)
-        )
+    with _LOCK:
+        cur = _CONN.execute(SQL_GET_EXPENSE, (expense_id,))
         row = cur.fetchone()
         if row:
-            cols = [d[0] for d in cur.description]
-            return {"status": "ok", "expense": dict(zip(cols, row))}
+            return {"status": "ok", "expense": dict(zip(_EXPENSE_COLS, row))}
         else:
             return {"status": "error", "message": f"Expense ID {expense_id} not found"}
 
 @mcp.tool()
 def edit_expense(expense_id: int, date=None, amount=None, category=None, subcategory=None, note=None):
     '''Update an existing expense. Only provided fields will be updated.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute("SELECT id FROM expenses WHERE id = ?", (expense_id,))
-        if not cur.fetchone():
-            return {"status": "error", "message": f"Expense ID {expense_id} not found"}
-        
-        updates = []
-        params = []
-        
-        if date is not None:
-            updates.append("date = ?")
-            params.append(date)
-        if amount is not None:
-            updates.append("amount = ?")
-            params.append(amount)
-        if category is not None:
-            updates.append("category = ?")
-            params.append(category)
-        if subcategory is not None:
-            updates.append("subcategory = ?")
-            params.append(subcategory)
-        if note is not None:
-            updates.append("note = ?")
-            params.append(note)
-        
-        if not updates:
-            return {"status": "error", "message": "No fields to update"}
-        
-        params.append(expense_id)
-        query = f"UPDATE expenses SET {', '.join(updates)} WHERE id = ?"
-        c.execute(query, params)
-        
-        return {"status": "ok", "message": f"Expense ID {expense_id} updated successfully"}
+    # Bitmask of the provided fields selects one of the prebuilt UPDATE statements
+    mask = 0
+    params = []
+    for i, value in enumerate((date, amount, category, subcategory, note)):
+        if value is not None:
+            mask |= 1 << i
+            params.append(value)
+    
+    if not mask:
+        return _ERR_NO_FIELDS
+    
+    params.append(expense_id)
+    # RETURNING yields a row only if the id existed, so no separate lookup is needed
+    with _LOCK:
+        row = _CONN.execute(SQL_UPDATE_EXPENSE[mask], params).fetchone()
+        _WRITE_GEN[0] += 1
+    if row is None:
+        return {"status": "error", "message": f"Expense ID {expense_id} not found"}
+    
+    return {"status": "ok", "message": f"Expense ID {expense_id} updated successfully"}
 
 @mcp.tool()
 def delete_expense(expense_id: int):
     '''Delete a single expense by its ID.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+    with _LOCK:
+        cur = _CONN.execute(SQL_DELETE_EXPENSE, (expense_id,))
+        _WRITE_GEN[0] += 1
         if cur.rowcount > 0:
             return {"status": "ok", "message": f"Expense ID {expense_id} deleted successfully"}
         else:
@@ -147,11 +286,10 @@ def delete_expense(expense_id: int):
 def bulk_delete_expenses(expense_ids: list):
     '''Delete multiple expenses at once. Provide a list of expense IDs.'''
     if not expense_ids:
-        return {"status": "error", "message": "No expense IDs provided"}
+        return _ERR_NO_EXPENSE_IDS
     
-    with sqlite3.connect(DB_PATH) as c:
-        placeholders = ','.join('?' * len(expense_ids))
-        cur = c.execute(f"DELETE FROM expenses WHERE id IN ({placeholders})", expense_ids)
+    with _txn():
+        cur = _CONN.executemany(SQL_DELETE_EXPENSE, [(i,) for i in expense_ids])
         deleted_count = cur.rowcount
         
         return {
@@ -160,87 +298,80 @@ def bulk_delete_expenses(expense_ids: list):
             "message": f"Successfully deleted {deleted_count} expense(s)"
         }
 
+@mcp.tool()
+def bulk_add_expenses(items: list[ExpenseItem]):
+    '''Add multiple expenses at once. Each item needs date, amount and category; subcategory and note are optional.'''
+    if not items:
+        return _ERR_NO_EXPENSES
+    
+    rows = [(i.date, i.amount, i.category, i.subcategory, i.note) for i in items]
+    
+    with _txn():
+        _CONN.executemany(SQL_INSERT_EXPENSE, rows)
+    
+    return {
+        "status": "ok",
+        "inserted_count": len(rows),
+        "message": f"Successfully added {len(rows)} expense(s)"
+    }
+
 # ==================== PHASE 2: INCOME TRACKING ====================
 
 @mcp.tool()
 def add_income(date, amount, source, note=""):
     '''Add a new income entry (salary, freelance, investments, etc).'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            "INSERT INTO income(date, amount, source, note) VALUES (?,?,?,?)",
-            (date, amount, source, note)
-        )
+    with _LOCK:
+        cur = _CONN.execute(SQL_INSERT_INCOME, (date, amount, source, note))
+        _WRITE_GEN[0] += 1
         return {"status": "ok", "id": cur.lastrowid}
 
 @mcp.tool()
 def list_income(start_date, end_date):
     '''List income entries within an inclusive date range.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            """
-            SELECT id, date, amount, source, note
-            FROM income
-            WHERE date BETWEEN ? AND ?
-            ORDER BY id ASC
-            """,
-            (start_date, end_date)
-        )
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, r)) for r in cur.fetchall()]
+    with _LOCK:
+        return _fetch_dicts(_INCOME_COLS, SQL_LIST_INCOME, (start_date, end_date))
 
 @mcp.tool()
 def get_income(income_id: int):
     '''Retrieve a single income entry by its ID.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            "SELECT id, date, amount, source, note FROM income WHERE id = ?",
-            (income_id,)
-        )
+    with _LOCK:
+        cur = _CONN.execute(SQL_GET_INCOME, (income_id,))
         row = cur.fetchone()
         if row:
-            cols = [d[0] for d in cur.description]
-            return {"status": "ok", "income": dict(zip(cols, row))}
+            return {"status": "ok", "income": dict(zip(_INCOME_COLS, row))}
         else:
             return {"status": "error", "message": f"Income ID {income_id} not found"}
 
 @mcp.tool()
 def edit_income(income_id: int, date=None, amount=None, source=None, note=None):
     '''Update an existing income entry. Only provided fields will be updated.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute("SELECT id FROM income WHERE id = ?", (income_id,))
-        if not cur.fetchone():
-            return {"status": "error", "message": f"Income ID {income_id} not found"}
-        
-        updates = []
-        params = []
-        
-        if date is not None:
-            updates.append("date = ?")
-            params.append(date)
-        if amount is not None:
-            updates.append("amount = ?")
-            params.append(amount)
-        if source is not None:
-            updates.append("source = ?")
-            params.append(source)
-        if note is not None:
-            updates.append("note = ?")
-            params.append(note)
-        
-        if not updates:
-            return {"status": "error", "message": "No fields to update"}
-        
-        params.append(income_id)
-        query = f"UPDATE income SET {', '.join(updates)} WHERE id = ?"
-        c.execute(query, params)
-        
-        return {"status": "ok", "message": f"Income ID {income_id} updated successfully"}
+    # Bitmask of the provided fields selects one of the prebuilt UPDATE statements
+    mask = 0
+    params = []
+    for i, value in enumerate((date, amount, source, note)):
+        if value is not None:
+            mask |= 1 << i
+            params.append(value)
+    
+    if not mask:
+        return _ERR_NO_FIELDS
+    
+    params.append(income_id)
+    # RETURNING yields a row only if the id existed, so no separate lookup is needed
+    with _LOCK:
+        row = _CONN.execute(SQL_UPDATE_INCOME[mask], params).fetchone()
+        _WRITE_GEN[0] += 1
+    if row is None:
+        return {"status": "error", "message": f"Income ID {income_id} not found"}
+    
+    return {"status": "ok", "message": f"Income ID {income_id} updated successfully"}
 
 @mcp.tool()
 def delete_income(income_id: int):
     '''Delete a single income entry by its ID.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute("DELETE FROM income WHERE id = ?", (income_id,))
+    with _LOCK:
+        cur = _CONN.execute(SQL_DELETE_INCOME, (income_id,))
+        _WRITE_GEN[0] += 1
         if cur.rowcount > 0:
             return {"status": "ok", "message": f"Income ID {income_id} deleted successfully"}
         else:
@@ -249,57 +380,50 @@ def delete_income(income_id: int):
 @mcp.tool()
 def net_cashflow(start_date, end_date):
     '''Calculate net cashflow (income minus expenses) for a date range.'''
-    with sqlite3.connect(DB_PATH) as c:
-        cur = c.execute(
-            "SELECT COALESCE(SUM(amount), 0) FROM income WHERE date BETWEEN ? AND ?",
-            (start_date, end_date)
-        )
-        total_income = cur.fetchone()[0]
-        
-        cur = c.execute(
-            "SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date BETWEEN ? AND ?",
-            (start_date, end_date)
-        )
-        total_expenses = cur.fetchone()[0]
-        
-        net = total_income - total_expenses
+    with _LOCK:
+        # Both totals come from one statement, so they share a read snapshot
+        total_income, total_expenses, net, positive = _CONN.execute(
+            SQL_NET_CASHFLOW, (start_date, end_date)
+        ).fetchone()
         
         return {
             "start_date": start_date,
             "end_date": end_date,
-            "total_income": round(total_income, 2),
-            "total_expenses": round(total_expenses, 2),
-            "net_cashflow": round(net, 2),
-            "status": "positive" if net >= 0 else "negative"
+            "total_income": total_income,
+            "total_expenses": total_expenses,
+            "net_cashflow": net,
+            "status": _CASHFLOW_STATUS[positive]
         }
 
+@functools.lru_cache(maxsize=256)
+def _summarize_income_cached(gen, start_date, end_date, source):
+    """Summary rows as of generation gen, which is only part of the cache key."""
+    with _LOCK:
+        if source:
+            cur = _CONN.execute(SQL_SUM_ONE_SRC, (start_date, end_date, source))
+        else:
+            cur = _CONN.execute(SQL_SUM_BY_SRC, (start_date, end_date))
+        return list(_rows_to_dicts(_SRC_SUM_COLS, cur.fetchall()))
+
 @mcp.tool()
 def summarize_income(start_date, end_date, source=None):
     '''Summarize income by source within an inclusive date range.'''
-    with sqlite3.connect(DB_PATH) as c:
-        query = (
-            """
-            SELECT source, SUM(amount) AS total_amount
-            FROM income
-            WHERE date BETWEEN ? AND ?
-            """
-        )
-        params = [start_date, end_date]
-        if source:
-            query += " AND source = ?"
-            params.append(source)
-        query += " GROUP BY source ORDER BY source ASC"
-        cur = c.execute(query, params)
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, r)) for r in cur.fetchall()]
+    return _summarize_income_cached(_generation(), start_date, end_date, source)
 
 # ==================== ORIGINAL RESOURCE ====================
 
+# Cached categories.json contents, keyed by the file's mtime
+_CAT_CACHE = {"mtime": 0, "data": ""}
+
 @mcp.resource("expense://categories", mime_type="application/json")
 def categories():
-    # Read fresh each time so you can edit the file without restarting
-    with open(CATEGORIES_PATH, "r", encoding="utf-8") as f:
-        return f.read()
+    # Re-read only when the file changes, so edits still apply without restarting
+    st = os.stat(CATEGORIES_PATH)
+    if st.st_mtime_ns != _CAT_CACHE["mtime"]:
+        with open(CATEGORIES_PATH, "r", encoding="utf-8") as f:
+            _CAT_CACHE["data"] = f.read()
+        _CAT_CACHE["mtime"] = st.st_mtime_ns
+    return _CAT_CACHE["data"]
 
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
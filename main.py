@@ -1,8 +1,14 @@
 from fastmcp import FastMCP
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
+import asyncio
 import aiosqlite
 import sqlite3
 import json
+import orjson
+from pydantic import BaseModel
 
 # ==================== CRITICAL FIX ====================
 # In FastMCP Cloud, the code directory is Read-Only.
@@ -12,7 +18,187 @@ DB_PATH = "/tmp/expenses.db"
 
 CATEGORIES_PATH = os.path.join(os.path.dirname(__file__), "categories.json")
 
-mcp = FastMCP("ExpenseTracker")
+# Applied once when a shared connection is opened. journal_mode persists in
+# the DB file, so only the writer sets it; the rest are per-connection settings.
+_CONN_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+    PRAGMA busy_timeout=5000;
+"""
+
+# Shared connections reused by every tool (opened once instead of per call).
+# Reads use the read-only aiosqlite connection _DB_R. Writes run on a plain
+# sqlite3 connection owned by a single worker thread: one run_in_executor hop
+# per write instead of aiosqlite's per-statement queue round-trips, and the
+# single worker also serializes writes.
+_DB_R: aiosqlite.Connection | None = None
+_DB_INIT_LOCK = asyncio.Lock()
+_WRITE_EXEC = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+_WRITE_CONN: sqlite3.Connection | None = None
+
+def _write_conn() -> sqlite3.Connection:
+    """Return the write connection, opening it on first use. Only call on the writer thread."""
+    global _WRITE_CONN
+    if _WRITE_CONN is None:
+        conn = sqlite3.connect(f"file:{DB_PATH}?mode=rwc", uri=True, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_CONN_PRAGMAS)
+        _WRITE_CONN = conn
+    return _WRITE_CONN
+
+def _close_write_conn():
+    global _WRITE_CONN
+    if _WRITE_CONN is not None:
+        _WRITE_CONN.close()
+        _WRITE_CONN = None
+
+def _in_write_txn(fn):
+    """Run fn(conn) in a BEGIN IMMEDIATE transaction, rolling back if it raises.
+    
+    The write lock is taken up front, so there is no deferred-to-write lock upgrade.
+    """
+    c = _write_conn()
+    c.execute("BEGIN IMMEDIATE")
+    try:
+        result = fn(c)
+    except BaseException:
+        c.execute("ROLLBACK")
+        raise
+    c.execute("COMMIT")
+    return result
+
+async def _run_write(fn):
+    """Run fn(conn) on the writer thread inside a write transaction and return its result."""
+    return await asyncio.get_running_loop().run_in_executor(_WRITE_EXEC, _in_write_txn, fn)
+
+async def _open_db():
+    global _DB_R
+    async with _DB_INIT_LOCK:
+        if _DB_R is None:
+            db = await aiosqlite.connect(f"file:{DB_PATH}?mode=ro", uri=True, isolation_level=None)
+            await db.executescript(_CONN_PRAGMAS)
+            db.row_factory = aiosqlite.Row
+            _DB_R = db
+
+async def get_read_db() -> aiosqlite.Connection:
+    """Return the shared read-only connection, opening it on first use."""
+    if _DB_R is None:
+        await _open_db()
+    return _DB_R
+
+async def close_db():
+    """Close the shared connections if they were opened."""
+    global _DB_R
+    # The write connection is closed even if closing the reader is cancelled
+    # or fails, so neither worker thread is left running
+    try:
+        if _DB_R is not None:
+            await _DB_R.close()
+    finally:
+        _DB_R = None
+        await asyncio.get_running_loop().run_in_executor(_WRITE_EXEC, _close_write_conn)
+
+async def _fetchone(c, sql, params):
+    """Fetch the first row of a query in a single round-trip, or None."""
+    rows = await c.execute_fetchall(sql, params)
+    return rows[0] if rows else None
+
+# Accepted date formats: YYYY-MM-DD, optionally followed by HH:MM:SS
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?: [0-9]{2}:[0-9]{2}:[0-9]{2})?")
+
+def _check_date(*dates):
+    """Return an error response for the first malformed date, or None if all are valid (None dates are skipped)."""
+    for d in dates:
+        if d is not None and not (isinstance(d, str) and _DATE_RE.fullmatch(d)):
+            return {"status": "error", "message": f"Invalid date {d!r}, expected YYYY-MM-DD"}
+    return None
+
+# Fixed error responses, built once and shared by every call that returns them
+# Largest page the list tools will return in one call
+_MAX_LIMIT = 5000
+_ERR_BAD_LIMIT = {"status": "error", "message": f"limit must be between 1 and {_MAX_LIMIT}"}
+# Ids are SQLite INTEGERs, so a cursor outside this range cannot be bound
+_MAX_ID = 2**63 - 1
+_ERR_BAD_AFTER_ID = {"status": "error", "message": f"after_id must be between 0 and {_MAX_ID}"}
+_ERR_NO_FIELDS = {"status": "error", "message": "No fields to update"}
+_ERR_NO_EXPENSE_IDS = {"status": "error", "message": "No expense IDs provided"}
+_ERR_NO_EXPENSES = {"status": "error", "message": "No expenses provided"}
+_ERR_NO_INCOME = {"status": "error", "message": "No income entries provided"}
+
+# Rows pulled per fetchmany() when streaming list results
+_FETCH_CHUNK = 500
+
+async def _fetch_dicts(c, sql, params):
+    """Run a query and build row dicts chunk by chunk so only one chunk of Row objects is alive at a time."""
+    out = []
+    async with c.execute(sql, params) as cur:
+        while True:
+            chunk = await cur.fetchmany(_FETCH_CHUNK)
+            out.extend({**row} for row in chunk)
+            if len(chunk) < _FETCH_CHUNK:
+                break
+    return out
+
+@asynccontextmanager
+async def lifespan(server):
+    await get_read_db()
+    await asyncio.get_running_loop().run_in_executor(_WRITE_EXEC, _write_conn)
+    try:
+        yield
+    finally:
+        await close_db()
+
+def _serialize_result(data) -> str:
+    """Encode tool results with orjson instead of FastMCP's default JSON encoder."""
+    return orjson.dumps(data, default=str).decode()
+
+mcp = FastMCP("ExpenseTracker", lifespan=lifespan, tool_serializer=_serialize_result)
+
+def _rollup_triggers(table: str, rollup: str, key: str) -> str:
+    """Triggers that keep `rollup` in sync with `table`.
+    
+    Each write adjusts its (date, key) row by the changed amount in O(1), so
+    bulk writes stay linear. The REAL totals can pick up float error across
+    edits and deletes; the summary queries round it away at read time.
+    """
+    add_new = f"""
+            INSERT INTO {rollup}(date, {key}, total, cnt) VALUES (new.date, new.{key}, new.amount, 1)
+            ON CONFLICT(date, {key}) DO UPDATE SET total = total + excluded.total, cnt = cnt + 1;
+    """
+    remove_old = f"""
+            UPDATE {rollup} SET total = total - old.amount, cnt = cnt - 1
+            WHERE date = old.date AND {key} = old.{key};
+            DELETE FROM {rollup} WHERE date = old.date AND {key} = old.{key} AND cnt = 0;
+    """
+    return f"""
+        CREATE TRIGGER {rollup}_ai AFTER INSERT ON {table} BEGIN {add_new} END;
+        CREATE TRIGGER {rollup}_ad AFTER DELETE ON {table} BEGIN {remove_old} END;
+        CREATE TRIGGER {rollup}_au AFTER UPDATE OF date, amount, {key} ON {table} BEGIN {remove_old} {add_new} END;
+    """
+
+def _rollup_ddl(table: str, rollup: str, key: str) -> str:
+    """SQL that (re)builds a per-(date, key) rollup of `table` and its triggers."""
+    return f"""
+        CREATE TABLE IF NOT EXISTS {rollup}(
+            date TEXT NOT NULL,
+            {key} TEXT NOT NULL,
+            total REAL NOT NULL,
+            cnt INTEGER NOT NULL,
+            PRIMARY KEY(date, {key})
+        ) WITHOUT ROWID;
+        
+        DROP TRIGGER IF EXISTS {rollup}_ai;
+        DROP TRIGGER IF EXISTS {rollup}_ad;
+        DROP TRIGGER IF EXISTS {rollup}_au;
+        
+        DELETE FROM {rollup};
+        INSERT INTO {rollup}(date, {key}, total, cnt)
+        SELECT date, {key}, SUM(amount), COUNT(*) FROM {table} GROUP BY date, {key};
+        
+        {_rollup_triggers(table, rollup, key)}
+    """
 
 def init_db():
     """Initialize the database synchronously to ensure tables exist before server starts."""
@@ -43,6 +229,22 @@ def init_db():
                 note TEXT DEFAULT ''
             )
         """)
+        
+        # Covering indexes for the date-range list/summarize/cashflow queries
+        c.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date_cat ON expenses(date, category, amount)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_income_date_src ON income(date, source, amount)")
+        
+        # Daily rollups used by summarize/summarize_income. They are rebuilt from
+        # the base tables when missing or when their triggers differ from the
+        # current definition
+        for table, rollup, key in (("expenses", "expenses_daily", "category"), ("income", "income_daily", "source")):
+            row = c.execute("SELECT sql FROM sqlite_master WHERE name = ?", (f"{rollup}_ai",)).fetchone()
+            if row is None or row[0] not in _rollup_triggers(table, rollup, key):
+                c.executescript("BEGIN;" + _rollup_ddl(table, rollup, key) + "COMMIT;")
+        
+        # Gather planner statistics once so the new indexes get picked up
+        if not c.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            c.execute("ANALYZE")
         c.commit()
 
 # Initialize DB immediately on module load
@@ -52,303 +254,364 @@ try:
 except Exception as e:
     print(f"Failed to initialize database: {e}")
 
+# ==================== SQL ====================
+# Statements are kept as constants so the same text is always submitted and
+# the connection's statement cache can reuse the compiled statement.
+
+def _update_statements(table: str, fields: tuple[str, ...]) -> dict[int, str]:
+    """UPDATE ... RETURNING id for every non-empty subset of fields, keyed by bitmask (bit i = fields[i])."""
+    return {
+        mask: f"UPDATE {table} SET {', '.join(f'{f} = ?' for i, f in enumerate(fields) if mask >> i & 1)} WHERE id = ? RETURNING id"
+        for mask in range(1, 1 << len(fields))
+    }
+
+SQL_INSERT_EXPENSE = "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)"
+SQL_LIST_EXPENSES = """
+    SELECT id, date, amount, category, subcategory, note
+    FROM expenses
+    WHERE date BETWEEN ? AND ? AND id > ?
+    ORDER BY id ASC
+    LIMIT ?
+"""
+SQL_SUM_BY_CAT = """
+    SELECT category, ROUND(SUM(total), 2) AS total_amount
+    FROM expenses_daily
+    WHERE date BETWEEN ? AND ?
+    GROUP BY category ORDER BY category ASC
+"""
+SQL_SUM_ONE_CAT = """
+    SELECT category, ROUND(SUM(total), 2) AS total_amount
+    FROM expenses_daily
+    WHERE date BETWEEN ? AND ? AND category = ?
+    GROUP BY category ORDER BY category ASC
+"""
+SQL_GET_EXPENSE = "SELECT id, date, amount, category, subcategory, note FROM expenses WHERE id = ?"
+SQL_DELETE_EXPENSE = "DELETE FROM expenses WHERE id = ?"
+# IDs are bound as one JSON array, so the text is constant for any list length
+# and there is no bound-parameter limit
+SQL_BULK_DELETE_EXPENSES = "DELETE FROM expenses WHERE id IN (SELECT value FROM json_each(?))"
+SQL_UPDATE_EXPENSE = _update_statements("expenses", ("date", "amount", "category", "subcategory", "note"))
+
+SQL_INSERT_INCOME = "INSERT INTO income(date, amount, source, note) VALUES (?,?,?,?)"
+SQL_LIST_INCOME = """
+    SELECT id, date, amount, source, note
+    FROM income
+    WHERE date BETWEEN ? AND ? AND id > ?
+    ORDER BY id ASC
+    LIMIT ?
+"""
+SQL_SUM_BY_SRC = """
+    SELECT source, ROUND(SUM(total), 2) AS total_amount
+    FROM income_daily
+    WHERE date BETWEEN ? AND ?
+    GROUP BY source ORDER BY source ASC
+"""
+SQL_SUM_ONE_SRC = """
+    SELECT source, ROUND(SUM(total), 2) AS total_amount
+    FROM income_daily
+    WHERE date BETWEEN ? AND ? AND source = ?
+    GROUP BY source ORDER BY source ASC
+"""
+SQL_GET_INCOME = "SELECT id, date, amount, source, note FROM income WHERE id = ?"
+SQL_DELETE_INCOME = "DELETE FROM income WHERE id = ?"
+SQL_UPDATE_INCOME = _update_statements("income", ("date", "amount", "source", "note"))
+
+# Both totals are summed from the covering (date, key, amount) indexes, so they
+# match the raw entries exactly. Rounding and the sign test run in SQL on the
+# unrounded totals; ?1/?2 are the start and end dates
+SQL_NET_CASHFLOW = """
+    SELECT ROUND(inc, 2), ROUND(exp, 2), ROUND(inc - exp, 2), inc >= exp
+    FROM (SELECT
+        (SELECT COALESCE(SUM(amount), 0) FROM income WHERE date BETWEEN ?1 AND ?2) AS inc,
+        (SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date BETWEEN ?1 AND ?2) AS exp
+    )
+"""
+# Indexed by the inc >= exp flag returned above
+_CASHFLOW_STATUS = ("negative", "positive")
+
+# ==================== BULK ITEM MODELS ====================
+# Typed like the single-entry tools' arguments, so FastMCP validates every item
+
+class ExpenseItem(BaseModel):
+    date: str
+    amount: float
+    category: str
+    subcategory: str = ""
+    note: str = ""
+
+class IncomeItem(BaseModel):
+    date: str
+    amount: float
+    source: str
+    note: str = ""
+
 # ==================== TOOLS ====================
 
 @mcp.tool()
 async def add_expense(date: str, amount: float, category: str, subcategory: str = "", note: str = ""):
     '''Add a new expense entry to the database.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute(
-            "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)",
-            (date, amount, category, subcategory, note)
-        )
-        await c.commit()
-        return {"status": "ok", "id": cur.lastrowid}
+    if err := _check_date(date):
+        return err
+    cur = await _run_write(lambda c: c.execute(SQL_INSERT_EXPENSE, (date, amount, category, subcategory, note)))
+    return {"status": "ok", "id": cur.lastrowid}
     
 @mcp.tool()
-async def list_expenses(start_date: str, end_date: str):
-    '''List expense entries within an inclusive date range.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        c.row_factory = aiosqlite.Row
-        cur = await c.execute(
-            """
-            SELECT id, date, amount, category, subcategory, note
-            FROM expenses
-            WHERE date BETWEEN ? AND ?
-            ORDER BY id ASC
-            """,
-            (start_date, end_date)
-        )
-        rows = await cur.fetchall()
-        return [dict(row) for row in rows]
+async def list_expenses(start_date: str, end_date: str, limit: int = 500, after_id: int = 0):
+    '''List expense entries within an inclusive date range, one page at a time.
+    
+    Pass the returned next_after_id as after_id to get the next page; it is null on the last page.'''
+    if err := _check_date(start_date, end_date):
+        return err
+    if not 1 <= limit <= _MAX_LIMIT:
+        return _ERR_BAD_LIMIT
+    if not 0 <= after_id <= _MAX_ID:
+        return _ERR_BAD_AFTER_ID
+    c = await get_read_db()
+    rows = await _fetch_dicts(c, SQL_LIST_EXPENSES, (start_date, end_date, after_id, limit))
+    return {"rows": rows, "next_after_id": rows[-1]["id"] if len(rows) == limit else None}
 
 @mcp.tool()
 async def summarize(start_date: str, end_date: str, category: str = None):
     '''Summarize expenses by category within an inclusive date range.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        c.row_factory = aiosqlite.Row
-        query = (
-            """
-            SELECT category, SUM(amount) AS total_amount
-            FROM expenses
-            WHERE date BETWEEN ? AND ?
-            """
-        )
-        params = [start_date, end_date]
-        if category:
-            query += " AND category = ?"
-            params.append(category)
-        query += " GROUP BY category ORDER BY category ASC"
-        cur = await c.execute(query, params)
-        rows = await cur.fetchall()
-        return [dict(row) for row in rows]
+    if err := _check_date(start_date, end_date):
+        return err
+    c = await get_read_db()
+    if category:
+        rows = await c.execute_fetchall(SQL_SUM_ONE_CAT, (start_date, end_date, category))
+    else:
+        rows = await c.execute_fetchall(SQL_SUM_BY_CAT, (start_date, end_date))
+    return [{**row} for row in rows]
 
 @mcp.tool()
 async def get_expense(expense_id: int):
     '''Retrieve a single expense by its ID.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        c.row_factory = aiosqlite.Row
-        cur = await c.execute(
-            "SELECT id, date, amount, category, subcategory, note FROM expenses WHERE id = ?",
-            (expense_id,)
-        )
-        row = await cur.fetchone()
-        if row:
-            return {"status": "ok", "expense": dict(row)}
-        else:
-            return {"status": "error", "message": f"Expense ID {expense_id} not found"}
+    c = await get_read_db()
+    row = await _fetchone(c, SQL_GET_EXPENSE, (expense_id,))
+    if row:
+        return {"status": "ok", "expense": dict(row)}
+    else:
+        return {"status": "error", "message": f"Expense ID {expense_id} not found"}
 
 @mcp.tool()
 async def edit_expense(expense_id: int, date: str = None, amount: float = None, category: str = None, subcategory: str = None, note: str = None):
     '''Update an existing expense. Only provided fields will be updated.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute("SELECT id FROM expenses WHERE id = ?", (expense_id,))
-        if not await cur.fetchone():
-            return {"status": "error", "message": f"Expense ID {expense_id} not found"}
-        
-        updates = []
-        params = []
-        
-        if date is not None:
-            updates.append("date = ?")
-            params.append(date)
-        if amount is not None:
-            updates.append("amount = ?")
-            params.append(amount)
-        if category is not None:
-            updates.append("category = ?")
-            params.append(category)
-        if subcategory is not None:
-            updates.append("subcategory = ?")
-            params.append(subcategory)
-        if note is not None:
-            updates.append("note = ?")
-            params.append(note)
-        
-        if not updates:
-            return {"status": "error", "message": "No fields to update"}
-        
-        params.append(expense_id)
-        query = f"UPDATE expenses SET {', '.join(updates)} WHERE id = ?"
-        await c.execute(query, params)
-        await c.commit()
-        
-        return {"status": "ok", "message": f"Expense ID {expense_id} updated successfully"}
+    if err := _check_date(date):
+        return err
+    
+    # Bitmask of the provided fields selects one of the prebuilt UPDATE statements
+    mask = 0
+    params = []
+    for i, value in enumerate((date, amount, category, subcategory, note)):
+        if value is not None:
+            mask |= 1 << i
+            params.append(value)
+    
+    if not mask:
+        return _ERR_NO_FIELDS
+    
+    params.append(expense_id)
+    row = await _run_write(lambda c: c.execute(SQL_UPDATE_EXPENSE[mask], params).fetchone())
+    if row is None:
+        return {"status": "error", "message": f"Expense ID {expense_id} not found"}
+    
+    return {"status": "ok", "message": f"Expense ID {expense_id} updated successfully"}
 
 @mcp.tool()
 async def delete_expense(expense_id: int):
     '''Delete a single expense by its ID.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-        await c.commit()
-        if cur.rowcount > 0:
-            return {"status": "ok", "message": f"Expense ID {expense_id} deleted successfully"}
-        else:
-            return {"status": "error", "message": f"Expense ID {expense_id} not found"}
+    cur = await _run_write(lambda c: c.execute(SQL_DELETE_EXPENSE, (expense_id,)))
+    if cur.rowcount > 0:
+        return {"status": "ok", "message": f"Expense ID {expense_id} deleted successfully"}
+    else:
+        return {"status": "error", "message": f"Expense ID {expense_id} not found"}
 
 @mcp.tool()
 async def bulk_delete_expenses(expense_ids: list[int]):
     '''Delete multiple expenses at once. Provide a list of expense IDs.'''
     if not expense_ids:
-        return {"status": "error", "message": "No expense IDs provided"}
+        return _ERR_NO_EXPENSE_IDS
     
-    async with aiosqlite.connect(DB_PATH) as c:
-        placeholders = ','.join('?' * len(expense_ids))
-        cur = await c.execute(f"DELETE FROM expenses WHERE id IN ({placeholders})", expense_ids)
-        await c.commit()
-        deleted_count = cur.rowcount
-        
-        return {
-            "status": "ok",
-            "deleted_count": deleted_count,
-            "message": f"Successfully deleted {deleted_count} expense(s)"
-        }
+    cur = await _run_write(lambda c: c.execute(SQL_BULK_DELETE_EXPENSES, (json.dumps(expense_ids),)))
+    deleted_count = cur.rowcount
+    
+    return {
+        "status": "ok",
+        "deleted_count": deleted_count,
+        "message": f"Successfully deleted {deleted_count} expense(s)"
+    }
+
+@mcp.tool()
+async def bulk_add_expenses(items: list[ExpenseItem]):
+    '''Add multiple expenses at once. Each item needs date, amount and category; subcategory and note are optional.'''
+    if not items:
+        return _ERR_NO_EXPENSES
+    
+    rows = [(i.date, i.amount, i.category, i.subcategory, i.note) for i in items]
+    if err := _check_date(*(r[0] for r in rows)):
+        return err
+    
+    await _run_write(lambda c: c.executemany(SQL_INSERT_EXPENSE, rows))
+    
+    return {
+        "status": "ok",
+        "inserted_count": len(rows),
+        "message": f"Successfully added {len(rows)} expense(s)"
+    }
 
 # ==================== INCOME TOOLS ====================
 
 @mcp.tool()
 async def add_income(date: str, amount: float, source: str, note: str = ""):
     '''Add a new income entry (salary, freelance, investments, etc).'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute(
-            "INSERT INTO income(date, amount, source, note) VALUES (?,?,?,?)",
-            (date, amount, source, note)
-        )
-        await c.commit()
-        return {"status": "ok", "id": cur.lastrowid}
+    if err := _check_date(date):
+        return err
+    cur = await _run_write(lambda c: c.execute(SQL_INSERT_INCOME, (date, amount, source, note)))
+    return {"status": "ok", "id": cur.lastrowid}
 
 @mcp.tool()
-async def list_income(start_date: str, end_date: str):
-    '''List income entries within an inclusive date range.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        c.row_factory = aiosqlite.Row
-        cur = await c.execute(
-            """
-            SELECT id, date, amount, source, note
-            FROM income
-            WHERE date BETWEEN ? AND ?
-            ORDER BY id ASC
-            """,
-            (start_date, end_date)
-        )
-        rows = await cur.fetchall()
-        return [dict(row) for row in rows]
+async def bulk_add_income(items: list[IncomeItem]):
+    '''Add multiple income entries at once. Each item needs date, amount and source; note is optional.'''
+    if not items:
+        return _ERR_NO_INCOME
+    
+    rows = [(i.date, i.amount, i.source, i.note) for i in items]
+    if err := _check_date(*(r[0] for r in rows)):
+        return err
+    
+    await _run_write(lambda c: c.executemany(SQL_INSERT_INCOME, rows))
+    
+    return {
+        "status": "ok",
+        "inserted_count": len(rows),
+        "message": f"Successfully added {len(rows)} income record(s)"
+    }
+
+@mcp.tool()
+async def list_income(start_date: str, end_date: str, limit: int = 500, after_id: int = 0):
+    '''List income entries within an inclusive date range, one page at a time.
+    
+    Pass the returned next_after_id as after_id to get the next page; it is null on the last page.'''
+    if err := _check_date(start_date, end_date):
+        return err
+    if not 1 <= limit <= _MAX_LIMIT:
+        return _ERR_BAD_LIMIT
+    if not 0 <= after_id <= _MAX_ID:
+        return _ERR_BAD_AFTER_ID
+    c = await get_read_db()
+    rows = await _fetch_dicts(c, SQL_LIST_INCOME, (start_date, end_date, after_id, limit))
+    return {"rows": rows, "next_after_id": rows[-1]["id"] if len(rows) == limit else None}
 
 @mcp.tool()
 async def get_income(income_id: int):
     '''Retrieve a single income entry by its ID.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        c.row_factory = aiosqlite.Row
-        cur = await c.execute(
-            "SELECT id, date, amount, source, note FROM income WHERE id = ?",
-            (income_id,)
-        )
-        row = await cur.fetchone()
-        if row:
-            return {"status": "ok", "income": dict(row)}
-        else:
-            return {"status": "error", "message": f"Income ID {income_id} not found"}
+    c = await get_read_db()
+    row = await _fetchone(c, SQL_GET_INCOME, (income_id,))
+    if row:
+        return {"status": "ok", "income": dict(row)}
+    else:
+        return {"status": "error", "message": f"Income ID {income_id} not found"}
 
 @mcp.tool()
 async def edit_income(income_id: int, date: str = None, amount: float = None, source: str = None, note: str = None):
     '''Update an existing income entry.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute("SELECT id FROM income WHERE id = ?", (income_id,))
-        if not await cur.fetchone():
-            return {"status": "error", "message": f"Income ID {income_id} not found"}
-        
-        updates = []
-        params = []
-        
-        if date is not None:
-            updates.append("date = ?")
-            params.append(date)
-        if amount is not None:
-            updates.append("amount = ?")
-            params.append(amount)
-        if source is not None:
-            updates.append("source = ?")
-            params.append(source)
-        if note is not None:
-            updates.append("note = ?")
-            params.append(note)
-        
-        if not updates:
-            return {"status": "error", "message": "No fields to update"}
-        
-        params.append(income_id)
-        query = f"UPDATE income SET {', '.join(updates)} WHERE id = ?"
-        await c.execute(query, params)
-        await c.commit()
-        
-        return {"status": "ok", "message": f"Income ID {income_id} updated successfully"}
+    if err := _check_date(date):
+        return err
+    
+    # Bitmask of the provided fields selects one of the prebuilt UPDATE statements
+    mask = 0
+    params = []
+    for i, value in enumerate((date, amount, source, note)):
+        if value is not None:
+            mask |= 1 << i
+            params.append(value)
+    
+    if not mask:
+        return _ERR_NO_FIELDS
+    
+    params.append(income_id)
+    row = await _run_write(lambda c: c.execute(SQL_UPDATE_INCOME[mask], params).fetchone())
+    if row is None:
+        return {"status": "error", "message": f"Income ID {income_id} not found"}
+    
+    return {"status": "ok", "message": f"Income ID {income_id} updated successfully"}
 
 @mcp.tool()
 async def delete_income(income_id: int):
     '''Delete a single income entry by its ID.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute("DELETE FROM income WHERE id = ?", (income_id,))
-        await c.commit()
-        if cur.rowcount > 0:
-            return {"status": "ok", "message": f"Income ID {income_id} deleted successfully"}
-        else:
-            return {"status": "error", "message": f"Income ID {income_id} not found"}
+    cur = await _run_write(lambda c: c.execute(SQL_DELETE_INCOME, (income_id,)))
+    if cur.rowcount > 0:
+        return {"status": "ok", "message": f"Income ID {income_id} deleted successfully"}
+    else:
+        return {"status": "error", "message": f"Income ID {income_id} not found"}
 
 @mcp.tool()
 async def net_cashflow(start_date: str, end_date: str):
     '''Calculate net cashflow (income minus expenses) for a date range.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        cur = await c.execute(
-            "SELECT COALESCE(SUM(amount), 0) FROM income WHERE date BETWEEN ? AND ?",
-            (start_date, end_date)
-        )
-        row = await cur.fetchone()
-        total_income = row[0]
-        
-        cur = await c.execute(
-            "SELECT COALESCE(SUM(amount), 0) FROM expenses WHERE date BETWEEN ? AND ?",
-            (start_date, end_date)
-        )
-        row = await cur.fetchone()
-        total_expenses = row[0]
-        
-        net = total_income - total_expenses
-        
-        return {
-            "start_date": start_date,
-            "end_date": end_date,
-            "total_income": round(total_income, 2),
-            "total_expenses": round(total_expenses, 2),
-            "net_cashflow": round(net, 2),
-            "status": "positive" if net >= 0 else "negative"
-        }
+    if err := _check_date(start_date, end_date):
+        return err
+    c = await get_read_db()
+    total_income, total_expenses, net, positive = await _fetchone(
+        c, SQL_NET_CASHFLOW, (start_date, end_date)
+    )
+    
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_cashflow": net,
+        "status": _CASHFLOW_STATUS[positive]
+    }
 
 @mcp.tool()
 async def summarize_income(start_date: str, end_date: str, source: str = None):
     '''Summarize income by source within an inclusive date range.'''
-    async with aiosqlite.connect(DB_PATH) as c:
-        c.row_factory = aiosqlite.Row
-        query = (
-            """
-            SELECT source, SUM(amount) AS total_amount
-            FROM income
-            WHERE date BETWEEN ? AND ?
-            """
-        )
-        params = [start_date, end_date]
-        if source:
-            query += " AND source = ?"
-            params.append(source)
-        query += " GROUP BY source ORDER BY source ASC"
-        cur = await c.execute(query, params)
-        rows = await cur.fetchall()
-        return [dict(row) for row in rows]
+    if err := _check_date(start_date, end_date):
+        return err
+    c = await get_read_db()
+    if source:
+        rows = await c.execute_fetchall(SQL_SUM_ONE_SRC, (start_date, end_date, source))
+    else:
+        rows = await c.execute_fetchall(SQL_SUM_BY_SRC, (start_date, end_date))
+    return [{**row} for row in rows]
 
 # ==================== RESOURCES ====================
 
+# Cached categories.json contents, re-read only when the file's mtime changes
+_cat_cache: str | None = None
+_cat_mtime: float = 0.0
+
 @mcp.resource("expense://categories", mime_type="application/json")
 def categories():
+    global _cat_cache, _cat_mtime
     # Only try to read if the file exists, otherwise return empty
-    if os.path.exists(CATEGORIES_PATH):
+    try:
+        st = os.stat(CATEGORIES_PATH)
+    except FileNotFoundError:
+        return json.dumps({"error": "Categories file not found"})
+    if _cat_cache is None or st.st_mtime != _cat_mtime:
         with open(CATEGORIES_PATH, "r", encoding="utf-8") as f:
-            return f.read()
-    return json.dumps({"error": "Categories file not found"})
+            _cat_cache = f.read()
+        _cat_mtime = st.st_mtime
+    return _cat_cache
+
+# Static payload, serialized once at import time
+_SERVER_INFO_JSON = json.dumps({
+    "name" : "Expense Tracker Server",
+    "version" : "1.0.0",
+    "tools": [
+        "add_expense", "list_expenses", "get_expense", "edit_expense", 
+        "delete_expense", "bulk_delete_expenses", "bulk_add_expenses", "summarize",
+        "add_income", "bulk_add_income", "list_income", "get_income", "edit_income",
+        "delete_income", "net_cashflow", "summarize_income"
+    ],
+    "author" : "Nihal"
+}, indent = 2)
 
 @mcp.resource("info://server")
 def server_info() -> str:
     """Get information about this expense tracker server"""
-    info = {
-        "name" : "Expense Tracker Server",
-        "version" : "1.0.0",
-        "tools": [
-            "add_expense", "list_expenses", "get_expense", "edit_expense", 
-            "delete_expense", "bulk_delete_expenses", "summarize",
-            "add_income", "list_income", "get_income", "edit_income",
-            "delete_income", "net_cashflow", "summarize_income"
-        ],
-        "author" : "Nihal"
-    }
-    return json.dumps(info, indent = 2)
+    return _SERVER_INFO_JSON
 
 if __name__ == "__main__":
     mcp.run(transport="http", host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,6 +1,5 @@
 import random
 from fastmcp import FastMCP
-import random
 import json
 
 # Create a FastMCP server instance
@@ -19,6 +18,30 @@ def random_number(min_val: int = 1, max_val: int = 100) -> int:
       """
     return random.randint(min_val, max_val)
 
+# Dedicated generator for the batched tool
+_rng = random.Random()
+# Most numbers random_numbers will generate in one call
+_MAX_N = 10000
+
+@mcp.tool
+def random_numbers(n: int, min_val: int = 1, max_val: int = 100) -> list[int]:
+    """Generate n random numbers within the given range in one call.
+    
+    Args : 
+      n : How many numbers to generate (at most 10000)
+      min_val : Minimum Value (default 1)
+      max_val : Maximum Value (default 100)
+
+    Returns : 
+      A list of n random integers between the min_val and max_val
+      """
+    if not 0 <= n <= _MAX_N:
+        raise ValueError(f"n must be between 0 and {_MAX_N}")
+    if min_val > max_val:
+        raise ValueError("min_val must not be greater than max_val")
+    randint = _rng.randint
+    return [randint(min_val, max_val) for _ in range(n)]
+
 @mcp.tool
 def add_numbers(a: float, b: float) -> float:
     """Add two numbers together.
@@ -32,19 +55,21 @@ def add_numbers(a: float, b: float) -> float:
       """
     return a + b
 
+# Static payload, serialized once at import time
+_SERVER_INFO_JSON = json.dumps({
+    "name" : "Simple Calculator Server",
+    "version" : "1.0.0",
+    "description" : "A basic MCP server with math tools",
+    "tools" : ["add", "random_number", "random_numbers"],
+    "author" : "Nihal"
+}, indent = 2)
+
 @mcp.resource("info://server")
 def server_info() -> str:
     """
     Get information about this server
     """
-    info = {
-        "name" : "Simple Calculator Server",
-        "version" : "1.0.0",
-        "description" : "A basic MCP server with math tools",
-        "tools" : ["add", "random_number"],
-        "author" : "Nihal"
-    }
-    return json.dumps(info, indent = 2)
+    return _SERVER_INFO_JSON
 
 if __name__ == "__main__":
     mcp.run(transport = "http", host = "0.0.0.0", port = 8000)